@@ -0,0 +1,135 @@
+"""Сравнение движков MultiManga: пул потоков (`engine="threads"`) и асинхронный (`engine="async"`).
+
+Поднимает локальный сервер, который отдаёт галерею из `--pages` страниц,
+каждая отвечает с задержкой `--latency`, и скачивает её обоими движками
+с одинаковым `max_workers`.
+
+    pip install requests aiohttp
+    python benchmarks/engines.py --pages 1000 --workers 200 --latency 0.2
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import threading
+import time
+
+import aiohttp
+import requests
+
+from requests.adapters import HTTPAdapter
+
+from multimng import MultiManga
+
+HTML = """<html><head><link rel="canonical" href="{base}/1-bench.html"></head><body>
+<h1>bench</h1>
+<div id="cover"><img data-src="/img/0.jpg"></div>
+<div id="thumbnail-container">{images}</div>
+</body></html>"""
+
+
+class StubServer:
+    """HTTP сервер с галереей, работает в отдельном потоке"""
+    def __init__(self, pages: int, latency: float, size: int):
+        self.pages = pages
+        self.latency = latency
+        self.body = b"\xff" * size
+        self.port = None
+        self._ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while request_line := await reader.readline():
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    ...
+                path = request_line.split()[1].decode()
+                if path.startswith("/img/"):
+                    await asyncio.sleep(self.latency)
+                    body, content_type = self.body, "image/jpeg"
+                else:
+                    images = "".join(f'<img data-src="/img/{n}.jpg">' for n in range(1, self.pages + 1))
+                    body, content_type = HTML.format(base=self.base_url, images=images).encode(), "text/html"
+                writer.write(
+                    f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except ConnectionError:
+            ...
+        finally:
+            writer.close()
+
+
+class ThreadMonitor:
+    """Замеряет пиковое количество потоков процесса"""
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self) -> "ThreadMonitor":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def bench(name: str, api: MultiManga, base_url: str) -> None:
+    manga = api.get_info(f"{base_url}/1-bench.html")
+    with tempfile.TemporaryDirectory() as path, ThreadMonitor() as monitor:
+        wall, cpu = time.perf_counter(), time.process_time()
+        report = api.download_manga(manga, path)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    print(
+        f"{name:<8} {wall:>8.2f} s {len(report.ok) / wall:>10.1f} стр/с "
+        f"{cpu:>8.2f} s CPU {monitor.peak:>6} потоков   ошибок: {len(report.failed)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=1000, help="количество страниц в галерее")
+    parser.add_argument("--workers", type=int, default=200, help="max_workers для обоих движков")
+    parser.add_argument("--latency", type=float, default=0.2, help="задержка ответа на страницу, с")
+    parser.add_argument("--size", type=int, default=64 * 1024, help="размер страницы, байт")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    server = StubServer(args.pages, args.latency, args.size)
+    print(f"страниц: {args.pages}, max_workers: {args.workers}, задержка: {args.latency} с, размер: {args.size} байт")
+
+    with requests.Session() as session:
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=args.workers))
+        bench("threads", MultiManga(session, base_url=server.base_url, max_workers=args.workers), server.base_url)
+
+    with MultiManga(
+        lambda: aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)),
+        base_url=server.base_url,
+        max_workers=args.workers,
+        engine="async"
+    ) as api:
+        bench("async", api, server.base_url)
+
+
+if __name__ == "__main__":
+    main()
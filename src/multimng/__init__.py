@@ -1,17 +1,25 @@
 __all__ = [
     "MultiManga",
-    "AsyncMultiManga"
+    "AsyncMultiManga",
+    "RateLimiter",
+    "Hedger",
+    "PageCache",
+    "DownloadReport",
+    "PageStatus"
 ]
 
 from inspect import iscoroutinefunction as is_async
 from abc import ABC, abstractmethod
+from dataclasses import asdict
 from pathlib import Path
+from typing import Callable, Literal
 
-from .service import MangaManager, AsyncMangaManager
+from .service import MangaManager, AsyncMangaManager, MangaGateway, PageCache
 from .service.manga_service import BaseManager
+from .service.engine import LoopThread
 from .core.mngparser import MangaParser
-from .models import WorkManga, AsyncWorkManga
-from ._http import HasRequest
+from .models import WorkManga, AsyncWorkManga, DownloadReport, PageStatus
+from ._http import HasRequest, RateLimiter, Hedger
 from .config import config
 
 logger = config.logger("multi-manga")
@@ -25,43 +33,126 @@ class BaseMultiManga(ABC):
         base_url: str = None,
         max_try: int = None,
         max_workers: int = None,
+        rate_limiter: RateLimiter = None,
+        hedger: Hedger = None,
     ):  
         self._session = session
         self._max_try = config.MAX_TRY if not max_try else max_try
         self._base_url = config.BASE_URL if not base_url else base_url
         self._max_worker = config.MAX_WORKERS if not max_workers else max_workers
+        if rate_limiter is None and config.RATE_LIMIT:
+            rate_limiter = RateLimiter(
+                config.RATE_LIMIT,
+                config.RATE_BURST,
+                image_rate=config.IMAGE_RATE_LIMIT,
+                base_url=self._base_url,
+                state_dir=config.RATE_STATE_DIR
+            )
+        if rate_limiter is not None:
+            rate_limiter.bind(self._base_url)
         self.manager: BaseManager = manga_manager(
             self._session,
-            config.MAX_WORKERS,
+            self._max_worker,
             self._max_try,
             MangaParser(self._base_url),
-            self._base_url
+            self._base_url,
+            rate_limiter,
+            hedger
         )
     
     @abstractmethod
     def get_info(self, url: str) -> WorkManga: ...
     
     @abstractmethod
-    def download_manga(self, manga: WorkManga, path: Path | str) -> None: ...
+    def download_manga(self, manga: WorkManga, path: Path | str, *, fail_fast: bool = False) -> DownloadReport: ...
     
 class MultiManga(BaseMultiManga):
+    """Синхронный клиент.
+
+    По умолчанию (`engine="threads"`) страницы скачиваются пулом потоков.
+    С `engine="async"` запросы выполняет асинхронный движок на event loop'е
+    в фоновом потоке, а API остаётся блокирующим. В этом режиме `session`
+    должна быть асинхронной сессией либо функцией без аргументов, которая
+    её создаёт (например `aiohttp.ClientSession`), она будет вызвана внутри loop'а.
+    """
     def __init__(
         self,
-        session: HasRequest,
+        session: HasRequest | Callable[[], HasRequest],
         *,
         base_url: str = None,
         max_try: int = None,
-        max_workers: int = None
+        max_workers: int = None,
+        rate_limiter: RateLimiter = None,
+        hedger: Hedger = None,
+        engine: Literal["threads", "async"] = "threads"
     ):
-        super().__init__(MangaManager, session, base_url=base_url, max_try=max_try, max_workers=max_workers)
-        if is_async(session.request):
-            raise TypeError("Данный класс не поддерживает асинхронность")
+        self._engine: LoopThread | None = None
+        self._own_session = False
+        
+        if engine == "threads":
+            if is_async(session.request):
+                raise TypeError("Данный класс не поддерживает асинхронность")
+            super().__init__(MangaManager, session, base_url=base_url, max_try=max_try, max_workers=max_workers, rate_limiter=rate_limiter, hedger=hedger)
+            return
+        if engine != "async":
+            raise ValueError(f"Неподдерживаемый engine: {engine}")
+        
+        self._engine = LoopThread()
+        try:
+            if isinstance(session, type) or not hasattr(session, 'request'):
+                session = self._session = self._engine.run(self._create_session(session))
+                self._own_session = True
+            if not (hasattr(session, "__aenter__") or is_async(getattr(session, 'request', None))):
+                raise TypeError("Для engine='async' нужна асинхронная сессия")
+            super().__init__(AsyncMangaManager, session, base_url=base_url, max_try=max_try, max_workers=max_workers, rate_limiter=rate_limiter, hedger=hedger)
+        except BaseException:
+            # Иначе фоновый loop и созданная им сессия останутся висеть
+            self.close()
+            raise
+    
+    @staticmethod
+    async def _create_session(factory: Callable[[], HasRequest]) -> HasRequest:
+        return factory()
     
     def get_info(self, url) -> WorkManga:
-        return self.manager.get_info(url)  
+        if self._engine is None:
+            return self.manager.get_info(url)
+        
+        manga = self._engine.run(self.manager.get_info(url))
+        return WorkManga(**asdict(manga))
+    
+    def download_manga(self, manga, path, *, fail_fast = False) -> DownloadReport:
+        if self._engine is None:
+            return self.manager.download(manga, path, fail_fast=fail_fast)
+        
+        return self._engine.run(
+            self.manager.download(AsyncWorkManga(**asdict(manga)), path, fail_fast=fail_fast)
+        )
+    
+    def close(self) -> None:
+        """Останавливает асинхронный движок и закрывает созданную им сессию"""
+        if self._engine is None:
+            return
+        if self._own_session:
+            self._own_session = False
+            self._engine.run(self._close_session(self._session))
+        self._engine.close()
+    
+    @staticmethod
+    async def _close_session(session: HasRequest) -> None:
+        if hasattr(session, "aclose"):
+            await session.aclose()
+        elif hasattr(session, "close"):
+            if is_async(session.close):
+                await session.close()
+            else:
+                session.close()
     
-    def download_manga(self, manga, path):
-        self.manager.download(manga, path)
+    def __enter__(self) -> "MultiManga":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
         
 class AsyncMultiManga(BaseMultiManga):
     
@@ -71,9 +162,11 @@ class AsyncMultiManga(BaseMultiManga):
         *,
         base_url: str = None,
         max_try: int = None,
-        max_workers: int = None
+        max_workers: int = None,
+        rate_limiter: RateLimiter = None,
+        hedger: Hedger = None
     ):
-        super().__init__(AsyncMangaManager, session, base_url=base_url, max_try=max_try, max_workers=max_workers)
+        super().__init__(AsyncMangaManager, session, base_url=base_url, max_try=max_try, max_workers=max_workers, rate_limiter=rate_limiter, hedger=hedger)
         if hasattr(session, "__aenter__"):
             ...
         elif is_async(session.request):
@@ -84,5 +177,29 @@ class AsyncMultiManga(BaseMultiManga):
     async def get_info(self, url: str) -> AsyncWorkManga:
         return await self.manager.get_info(url)  
     
-    async def download_manga(self, manga: AsyncMangaManager, path):
-        await self.manager.download(manga, path)
\ No newline at end of file
+    async def download_manga(self, manga: AsyncWorkManga, path, *, fail_fast = False) -> DownloadReport:
+        return await self.manager.download(manga, path, fail_fast=fail_fast)
+    
+    async def get_image(self, url: str) -> bytes:
+        return await self.manager.get_image(url)
+    
+    async def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        *,
+        cache: PageCache = None,
+        prefetch: int = 5,
+        workers: int = 4
+    ) -> None:
+        """Запускает локальный HTTP шлюз, который отдаёт страницы по `/{id}/{page}`
+
+        Args:
+            host (str): Адрес для прослушивания
+            port (int): Порт для прослушивания
+            cache (PageCache, optional): Кэш страниц на диске и в памяти
+            prefetch (int): Сколько следующих страниц загружать заранее
+            workers (int): Количество фоновых загрузчиков
+        """
+        gateway = MangaGateway(self, cache=cache, prefetch=prefetch, workers=workers)
+        await gateway.serve_forever(host, port)
@@ -2,7 +2,15 @@ from typing import Protocol, overload
 from urllib.parse import urljoin
 from inspect import iscoroutinefunction as is_async
 
-from .errors import HTTPError
+import threading
+
+from .errors import HTTPError, get_status, is_retryable
+from .limiter import RateLimiter, TokenBucket
+from .hedging import Hedger, HedgeStats
+from .retry import FetchResult
+from ..config import config
+
+logger = config.logger(__name__)
 
 class Response(Protocol):
     content: bytes
@@ -31,14 +39,28 @@ class URL(Protocol): ...
 class BaseHttpManager:
     def __init__(
         self,
-        session: HasRequest
+        session: HasRequest,
+        limiter: RateLimiter | None = None,
+        hedger: Hedger | None = None
     ):
         if isinstance(session, BaseHttpManager):
             self._session = session._session
+            limiter = limiter if limiter else session._limiter
+            hedger = hedger if hedger else session._hedger
         elif hasattr(session, 'request'):
             self._session = session
         else:
             raise TypeError(f"Неподдерживаемый тип: {type(session).__name__}")
+        self._limiter = limiter
+        self._hedger = hedger
+    
+    def _sync_wait(self, url: str | URL) -> None:
+        if self._limiter is not None:
+            self._limiter.acquire(url)
+    
+    async def _async_wait(self, url: str | URL) -> None:
+        if self._limiter is not None:
+            await self._limiter.async_acquire(url)
     
     def raise_for_response(self, response: Response):
         if hasattr(response, 'raise_for_status'):
@@ -57,9 +79,10 @@ class BaseHttpManager:
         if 200 <= status < 300:
             return
         
-        raise HTTPError(f"Неожиданный код ответа: {status}")
+        raise HTTPError(f"Неожиданный код ответа: {status}", status=status)
     
     def _sync_get(self, url: str | URL, headers: dict[str, str] = {'referer': 'https://anihidecq.org/'}) -> str:
+        self._sync_wait(url)
         response = self._session.request(method = "GET", url = url, headers = headers)
         
         self.raise_for_response(response)
@@ -68,7 +91,9 @@ class BaseHttpManager:
         except AttributeError:
             return response.data.decode()
     
-    def _sync_get_content(self, url: str | URL, headers: dict[str, str] = {'referer': 'https://anihidecq.org/'}) -> bytes:
+    def _sync_get_content(self, url: str | URL, headers: dict[str, str] = {'referer': 'https://anihidecq.org/'}, *, rate_limit: bool = True) -> bytes:
+        if rate_limit:
+            self._sync_wait(url)
         response = self._session.request(method = "GET", url = url, headers = headers)
             
         self.raise_for_response(response)
@@ -88,6 +113,7 @@ class BaseHttpManager:
         else:
             raise TypeError("Данный класс не поддерживает асинхронность")
         is_httpx = hasattr(self._session, '__class__') and 'httpx' in str(self._session.__class__)
+        await self._async_wait(url)
         try:
             if is_httpx:
                 raise TypeError()
@@ -100,7 +126,7 @@ class BaseHttpManager:
             self.raise_for_response(response)
             return response.text
         
-    async def _async_get_content(self, url: str | URL, headers: dict[str, str] = {'referer': 'https://anihidecq.org/'}) -> bytes:
+    async def _async_get_content(self, url: str | URL, headers: dict[str, str] = {'referer': 'https://anihidecq.org/'}, *, rate_limit: bool = True) -> bytes:
         if hasattr(self._session, "__aenter__"):
             ...
         elif is_async(self._session.request):
@@ -109,17 +135,97 @@ class BaseHttpManager:
             raise TypeError("Данный класс не поддерживает асинхронность")
         
         is_httpx = hasattr(self._session, '__class__') and 'httpx' in str(self._session.__class__)
+        if rate_limit:
+            await self._async_wait(url)
         try:
             if is_httpx:
                 raise TypeError()
             async with self._session.request(method="GET", url=url, headers=headers) as response:
-                response.raise_for_status()
+                self.raise_for_response(response)
                 return await response.read()
             
         except (AttributeError, TypeError):
             response = await self._session.request(method="GET", url=url, headers=headers)
-            response.raise_for_status()
+            self.raise_for_response(response)
             try:
                 return response.content
             except AttributeError:
-                return await response.read()
\ No newline at end of file
+                return await response.read()
+    
+    def _sync_get_content_hedged(self, url: str | URL, headers: dict[str, str] = {'referer': 'https://anihidecq.org/'}) -> bytes:
+        if self._hedger is None:
+            return self._sync_get_content(url, headers)
+        
+        self._sync_wait(url)
+        return self._hedger.run_sync(
+            lambda: self._sync_get_content(url, headers, rate_limit=False),
+            lambda: self._sync_get_content(self._hedger.mirror_url(url), headers)
+        )
+    
+    async def _async_get_content_hedged(self, url: str | URL, headers: dict[str, str] = {'referer': 'https://anihidecq.org/'}) -> bytes:
+        if self._hedger is None:
+            return await self._async_get_content(url, headers)
+        
+        await self._async_wait(url)
+        return await self._hedger.run_async(
+            lambda: self._async_get_content(url, headers, rate_limit=False),
+            lambda: self._async_get_content(self._hedger.mirror_url(url), headers)
+        )
+    
+    def _sync_get_image(self, url: str | URL, *, max_try: int = config.MAX_TRY, cancel: threading.Event | None = None) -> FetchResult:
+        """Скачивает изображение с повторными попытками, ошибки не выбрасываются а попадают в результат
+
+        Args:
+            url (str | URL): URL изображения
+            max_try (int): Максимальное количество попыток
+            cancel (threading.Event, optional): Если установлен, новые попытки не делаются
+
+        Returns:
+            FetchResult: Содержимое либо последняя ошибка и количество попыток
+        """
+        result = FetchResult()
+        for try_num in range(1, max_try + 1):
+            if cancel is not None and cancel.is_set():
+                result.cancelled = True
+                return result
+            
+            result.attempts = try_num
+            logger.debug(f"{try_num}. Попытка скачать: {url}")
+            try:
+                result.content = self._sync_get_content_hedged(url, headers = {})
+                result.error = None
+                return result
+            except Exception as e:
+                result.error = e
+                if not self._log_failed_try(url, try_num, e):
+                    break
+        
+        logger.critical(f"Не получилось скачать: {url}")
+        return result
+    
+    async def _async_get_image(self, url: str | URL, *, max_try: int = config.MAX_TRY) -> FetchResult:
+        """Асинхронная версия `_sync_get_image`"""
+        result = FetchResult()
+        for try_num in range(1, max_try + 1):
+            result.attempts = try_num
+            logger.debug(f"{try_num}. Попытка скачать: {url}")
+            try:
+                result.content = await self._async_get_content_hedged(url)
+                result.error = None
+                return result
+            except Exception as e:
+                result.error = e
+                if not self._log_failed_try(url, try_num, e):
+                    break
+        
+        logger.critical(f"Не получилось скачать: {url}")
+        return result
+    
+    @staticmethod
+    def _log_failed_try(url: str | URL, try_num: int, error: Exception) -> bool:
+        """Логирует неудачную попытку и возвращает есть ли смысл повторять"""
+        logger.warning(f"{try_num}. Ошибка при попытке скачать {url}: {error}")
+        if is_retryable(error):
+            return True
+        logger.error(f"Код ответа {get_status(error)} для {url}, повторять не имеет смысла")
+        return False
@@ -1,2 +1,22 @@
 class HTTPError(Exception):
-    """Обозночает ошибку связаное с http запросом"""
\ No newline at end of file
+    """Обозночает ошибку связаное с http запросом"""
+    def __init__(self, *args, status: int | None = None):
+        super().__init__(*args)
+        self.status = status
+
+
+def get_status(error: BaseException) -> int | None:
+    """Достаёт HTTP код ответа из ошибки любой HTTP библиотеки (requests, httpx, aiohttp)"""
+    if isinstance(status := getattr(error, 'status', None), int):
+        return status
+    response = getattr(error, 'response', None)
+    for attr in ('status_code', 'status'):
+        if isinstance(status := getattr(response, attr, None), int):
+            return status
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """4xx (кроме 429) означает что повторный запрос ничего не изменит"""
+    status = get_status(error)
+    return status is None or status == 429 or not 400 <= status < 500
@@ -0,0 +1,212 @@
+__all__ = [
+    "Hedger",
+    "HedgeStats",
+]
+
+import asyncio
+import itertools
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, TypeVar
+from urllib.parse import urlparse, urlunparse
+
+from ..config import config
+
+T = TypeVar('T')
+
+
+@dataclass
+class HedgeStats:
+    """Статистика hedged запросов"""
+    requests: int = 0
+    hedged: int = 0
+    wins: int = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        """Доля запросов, для которых был отправлен дублирующий запрос"""
+        return self.hedged / self.requests if self.requests else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """Доля дублирующих запросов, которые завершились первыми"""
+        return self.wins / self.hedged if self.hedged else 0.0
+
+
+class Hedger:
+    """Отправляет дублирующий запрос, если основной выполняется дольше p95.
+
+    Задержка перед дублем — перцентиль `percentile` от времени последних
+    `window` успешных запросов. Пока замеров меньше `min_samples`,
+    используется `initial_delay`.
+
+    Args:
+        mirrors (Dict[str, List[str]], optional): Зеркала для хостов, например
+            `{"img.multi-manga.today": ["https://img2.multi-manga.today"]}`.
+            Если для хоста зеркал нет, дубль уходит на тот же URL
+        percentile (float): Перцентиль времени ответа после которого отправляется дубль
+        window (int): Сколько последних замеров учитывать
+        min_samples (int): Минимальное количество замеров для расчёта перцентиля
+        initial_delay (float): Задержка пока замеров недостаточно
+    """
+    def __init__(
+        self,
+        mirrors: Dict[str, List[str]] | None = None,
+        *,
+        percentile: float = 0.95,
+        window: int = 200,
+        min_samples: int = 20,
+        initial_delay: float = 2.0
+    ):
+        if not 0 < percentile < 1:
+            raise ValueError(f"Некорректный перцентиль: {percentile}")
+
+        self._mirrors = {
+            host: itertools.cycle(urls)
+            for host, urls in (mirrors or {}).items() if urls
+        }
+        self._percentile = percentile
+        self._samples: deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._initial_delay = initial_delay
+        self._pool_size = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.stats = HedgeStats()
+
+    @property
+    def delay(self) -> float:
+        """Текущая задержка перед отправкой дубля"""
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return self._initial_delay
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(len(samples) * self._percentile))]
+
+    def _record(self, started: float, *, hedged: bool = False, win: bool = False) -> None:
+        with self._lock:
+            self._samples.append(time.monotonic() - started)
+            self.stats.hedged += hedged
+            self.stats.wins += win
+
+    def mirror_url(self, url: str) -> str:
+        """Возвращает URL для дубля, заменяя хост на следующее зеркало"""
+        parsed = urlparse(str(url))
+        with self._lock:
+            if (mirrors := self._mirrors.get(parsed.netloc)) is None:
+                return url
+            mirror = urlparse(next(mirrors))
+        return urlunparse(parsed._replace(scheme=mirror.scheme or parsed.scheme, netloc=mirror.netloc))
+
+    def reserve(self, workers: int) -> ThreadPoolExecutor:
+        """Готовит пул потоков для `workers` одновременных синхронных запросов.
+
+        На каждый запрос нужен поток под основной запрос и поток под дубль,
+        поэтому пул не ограничивает параллельность вызывающего кода.
+        Если пул приходится увеличить, старый не останавливается: в нём ещё
+        могут выполняться запросы, он завершится сам, когда их не останется.
+
+        Returns:
+            ThreadPoolExecutor: Текущий пул
+        """
+        with self._lock:
+            if self._executor is None or self._pool_size < 2 * workers:
+                self._pool_size = max(self._pool_size, 2 * workers)
+                self._executor = ThreadPoolExecutor(self._pool_size, thread_name_prefix="hedge")
+            return self._executor
+
+    def run_sync(self, primary: Callable[[], T], hedge: Callable[[], T]) -> T:
+        """Выполняет `primary`, при задержке дублирует его через `hedge`.
+
+        Основной запрос тоже выполняется в пуле, иначе вызывающий поток
+        не сможет вернуть результат дубля, пока висит основной запрос.
+        Потоки нельзя прервать, поэтому проигравший запрос
+        дорабатывает в фоне, а его результат отбрасывается.
+        """
+        with self._lock:
+            self.stats.requests += 1
+            executor = self._executor
+        if executor is None:
+            executor = self.reserve(config.MAX_WORKERS)
+
+        # Время считается с фактического начала запроса, а не с постановки в очередь пула
+        clock: list[float] = []
+        running = threading.Event()
+
+        def timed_primary() -> T:
+            clock.append(time.monotonic())
+            running.set()
+            return primary()
+
+        first = executor.submit(timed_primary)
+        first.add_done_callback(lambda _: running.set())
+        running.wait()
+        started = clock[0] if clock else time.monotonic()
+        done, _ = wait([first], timeout=max(0.0, started + self.delay - time.monotonic()))
+        if done:
+            result = first.result()
+            self._record(started)
+            return result
+
+        try:
+            # Дубль идёт в тот же пул, что и основной запрос
+            second = executor.submit(hedge)
+        except RuntimeError:
+            # Пул остановлен через close(), дожидаемся основного запроса
+            result = first.result()
+            self._record(started)
+            return result
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: f.exception() is not None):
+                if future.exception() is not None and pending:
+                    continue
+                for other in pending:
+                    other.cancel()
+                result = future.result()
+                self._record(started, hedged=True, win=future is second)
+                return result
+
+    async def run_async(
+        self,
+        primary: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Асинхронная версия `run_sync`, проигравший запрос отменяется"""
+        with self._lock:
+            self.stats.requests += 1
+
+        started = time.monotonic()
+        first = asyncio.ensure_future(primary())
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.delay)
+            if done:
+                result = first.result()
+                self._record(started)
+                return result
+
+            second = asyncio.ensure_future(hedge())
+            pending.add(second)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: t.exception() is not None):
+                    if task.exception() is not None and pending:
+                        continue
+                    result = task.result()
+                    self._record(started, hedged=True, win=task is second)
+                    return result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor, self._pool_size = self._executor, None, 0
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
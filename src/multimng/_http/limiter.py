@@ -0,0 +1,200 @@
+__all__ = [
+    "TokenBucket",
+    "RateLimiter",
+]
+
+import asyncio
+import json
+import os
+import threading
+import time
+
+from pathlib import Path
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class _FileLock:
+    """Межпроцессная блокировка на основе файла"""
+    def __init__(self, path: Path):
+        self._path = path
+        self._fd: int | None = None
+
+    def __enter__(self) -> int:
+        self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+        return self._fd
+
+    def __exit__(self, *exc) -> None:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+class TokenBucket:
+    """Token bucket с поддержкой burst.
+
+    Если передан `state_path`, то состояние хранится в файле и разделяется
+    между всеми процессами, которые используют тот же путь.
+    """
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        *,
+        state_path: Path | str | None = None
+    ):
+        if rate <= 0:
+            raise ValueError(f"Некорректный rate: {rate}")
+        if burst < 1:
+            raise ValueError(f"Некорректный burst: {burst}")
+
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self._lock = threading.Lock()
+        self._state_path = Path(state_path) if state_path else None
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _take(self) -> float:
+        """Пытается взять токен
+
+        Returns:
+            float: 0 если токен получен, иначе сколько секунд надо подождать
+        """
+        with self._lock:
+            if self._state_path is None:
+                self._tokens, self._updated, wait = self._refill(self._tokens, self._updated, time.monotonic())
+                return wait
+
+            with _FileLock(self._state_path) as fd:
+                tokens, updated = self._load(fd)
+                tokens, updated, wait = self._refill(tokens, updated, time.time())
+                self._dump(fd, tokens, updated)
+                return wait
+
+    def _refill(self, tokens: float, updated: float, now: float) -> tuple[float, float, float]:
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            return tokens - 1, now, 0.0
+        return tokens, now, (1 - tokens) / self.rate
+
+    def _load(self, fd: int) -> tuple[float, float]:
+        os.lseek(fd, 0, os.SEEK_SET)
+        raw = os.read(fd, 4096)
+        try:
+            state = json.loads(raw)
+            return float(state["tokens"]), float(state["updated"])
+        except (ValueError, KeyError, TypeError):
+            return float(self.burst), time.time()
+
+    @staticmethod
+    def _dump(fd: int, tokens: float, updated: float) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, json.dumps({"tokens": tokens, "updated": updated}).encode())
+
+    def acquire(self) -> None:
+        """Блокирует поток пока не будет получен токен"""
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
+
+    async def async_acquire(self) -> None:
+        """Ждёт получения токена не блокируя event loop"""
+        while (wait := await self._async_take()) > 0:
+            await asyncio.sleep(wait)
+
+    async def _async_take(self) -> float:
+        # Файловая блокировка может ждать другие процессы, её нельзя держать в event loop
+        if self._state_path is None:
+            return self._take()
+        return await asyncio.to_thread(self._take)
+
+
+class RateLimiter:
+    """Ограничитель запросов в секунду.
+
+    Для HTML хоста (`base_url`) и для хостов с изображениями используются
+    отдельные token bucket'ы, каждый хост изображений получает свой bucket.
+    Если `base_url` не передан, его подставит `MultiManga`/`AsyncMultiManga`.
+
+    Args:
+        rate (float): Запросов в секунду к HTML хосту
+        burst (int): Размер burst для HTML хоста
+        image_rate (float, optional): Запросов в секунду к каждому хосту изображений. По умолчанию как `rate`
+        image_burst (int, optional): Размер burst для хостов изображений. По умолчанию как `burst`
+        base_url (str, optional): URL сайта, по нему определяется HTML хост. По умолчанию URL клиента
+        state_dir (Path | str, optional): Директория для разделяемого между процессами состояния
+    """
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        *,
+        image_rate: float | None = None,
+        image_burst: int | None = None,
+        base_url: str | None = None,
+        state_dir: Path | str | None = None
+    ):
+        self._rate = rate
+        self._burst = burst
+        self._image_rate = image_rate if image_rate else rate
+        self._image_burst = image_burst if image_burst else burst
+        self._has_image_limits = bool(image_rate or image_burst)
+        self._html_host = urlparse(base_url).netloc if base_url else None
+        self._state_dir = Path(state_dir) if state_dir else None
+        if self._state_dir is not None:
+            self._state_dir.mkdir(parents=True, exist_ok=True)
+
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bind(self, base_url: str) -> None:
+        """Задаёт HTML хост, если он не был передан в конструктор"""
+        with self._lock:
+            if self._html_host is None:
+                self._html_host = urlparse(base_url).netloc
+                self._buckets.clear()
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Возвращает bucket для хоста из url"""
+        host = urlparse(str(url)).netloc
+        with self._lock:
+            if (bucket := self._buckets.get(host)) is not None:
+                return bucket
+
+            if self._html_host is None and self._has_image_limits:
+                raise ValueError("Для image_rate/image_burst нужен base_url, иначе HTML хост не отличить от хостов изображений")
+            is_html = self._html_host is None or host == self._html_host
+            state_path = None
+            if self._state_dir is not None:
+                state_path = self._state_dir / f"{host.replace(':', '_') or 'default'}.bucket"
+
+            bucket = TokenBucket(
+                self._rate if is_html else self._image_rate,
+                self._burst if is_html else self._image_burst,
+                state_path=state_path
+            )
+            self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> None:
+        self.bucket(url).acquire()
+
+    async def async_acquire(self, url: str) -> None:
+        await self.bucket(url).async_acquire()
@@ -0,0 +1,22 @@
+__all__ = [
+    "FetchResult"
+]
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .errors import get_status
+
+
+@dataclass
+class FetchResult:
+    """Итог скачивания с повторными попытками"""
+    content: Optional[bytes] = field(default=None)
+    attempts: int = field(default=0)
+    error: Optional[Exception] = field(default=None)
+    cancelled: bool = field(default=False)
+
+    @property
+    def status(self) -> Optional[int]:
+        """HTTP код ответа последней ошибки, если он известен"""
+        return get_status(self.error) if self.error is not None else None
@@ -12,12 +12,24 @@ import os
 load_dotenv()
 _log_format = f"%(asctime)s - [%(levelname)s] - %(name)s - (%(filename)s).%(funcName)s(%(lineno)d) - %(message)s"
 
+def _get_float(name: str, default: float | None = None) -> float | None:
+    """Читает положительное число из окружения, при некорректном значении возвращает default"""
+    try:
+        value = float(os.getenv(name, ""))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
 @dataclass
 class Config:
     DEBUG = os.getenv("DEBUG") == "True"
     MAX_TRY = int(os.getenv("MAX_TRY")) if os.getenv("MAX_TRY") and os.getenv("MAX_TRY").isdigit() else 3
     BASE_URL = os.getenv("BASE_URL") if os.getenv("BASE_URL") else "https://multi-manga.today"
     MAX_WORKERS = int(os.getenv("MAX_WORKERS")) if os.getenv("MAX_WORKERS") and os.getenv("MAX_WORKERS").isdigit() else 5
+    RATE_LIMIT = _get_float("RATE_LIMIT")
+    RATE_BURST = int(os.getenv("RATE_BURST")) if os.getenv("RATE_BURST") and os.getenv("RATE_BURST").isdigit() else 1
+    IMAGE_RATE_LIMIT = _get_float("IMAGE_RATE_LIMIT")
+    RATE_STATE_DIR = os.getenv("RATE_STATE_DIR") if os.getenv("RATE_STATE_DIR") else None
     def logger(self, name: str):
         return LoggerFactory(name)
 
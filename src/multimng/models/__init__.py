@@ -1,6 +1,10 @@
 __all__ = [
     "AsyncWorkManga",
-    "WorkManga"
+    "WorkManga",
+    "DownloadReport",
+    "PageResult",
+    "PageStatus"
 ]
 
-from .entites import AsyncWorkManga, WorkManga
\ No newline at end of file
+from .entites import AsyncWorkManga, WorkManga
+from .report import DownloadReport, PageResult, PageStatus
\ No newline at end of file
@@ -7,20 +7,24 @@ __all__ = [
 
 import json
 import os
+import time
 import asyncio
+import threading
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
 from dataclasses import dataclass, field, asdict
 from abc import ABC, abstractmethod
-from typing import List, Optional, Awaitable
+from typing import List, Optional
 from pathlib import Path
 
 import aiofiles
+import aiofiles.os
 
-from .._http import HasRequest, BaseHttpManager, HTTPError
+from .._http import HasRequest, BaseHttpManager, FetchResult
 from .._http import is_async
 from ..config import config
+from .report import DownloadReport, PageResult, PageStatus
 
 logger = config.logger(__name__)
 
@@ -58,7 +62,7 @@ class BaseManga(Manga, ABC):
                 file
             )
     @abstractmethod
-    def _download_img(self, url: str, path: Path | str, session: BaseHttpManager, *, max_try: int = config.MAX_TRY) -> None:
+    def _download_img(self, url: str, path: Path | str, session: BaseHttpManager, *, max_try: int = config.MAX_TRY) -> PageResult:
         """Скачивает фотографию
 
         Args:
@@ -66,18 +70,40 @@ class BaseManga(Manga, ABC):
             path (Path | str): Путь к файлу
             max_try (int): Максимальное количество попыток
             session (BaseHttpManager): HttpManager для скачивание
+
+        Returns:
+            PageResult: Результат скачивания, ошибки не выбрасываются а попадают в результат
         """
         
     @abstractmethod
-    def download(self, path: Path | str, session: HasRequest | BaseHttpManager, *, max_workers: int = 5):
+    def download(self, path: Path | str, session: HasRequest | BaseHttpManager, *, max_workers: int = 5, fail_fast: bool = False) -> DownloadReport:
         """download Скачивает всю галлерею из gallery
 
         Args:
             path (Path | str): Директория для скачивание файла
             session (HasRequest | BaseHttpManager): Сессия HTTP библиотеки либо нащ кастомный класс
             max_workers (int, optional): Максимальное количество потоков для работы. Defaults to 5.
+            fail_fast (bool, optional): Отменить оставшиеся страницы после первой неудачной. Defaults to False.
+
+        Returns:
+            DownloadReport: Отчёт по каждой странице
         """
 
+    @staticmethod
+    def _fetch_result(url: str, path: Path, fetched: FetchResult, started: float) -> PageResult | None:
+        """Превращает неудачное скачивание в PageResult, для удачного возвращает None"""
+        if fetched.cancelled:
+            return PageResult(url, path, PageStatus.CANCELLED, duration=time.monotonic() - started, attempts=fetched.attempts)
+        if fetched.content is None:
+            return PageResult(
+                url, path, PageStatus.FAILED,
+                duration=time.monotonic() - started,
+                attempts=fetched.attempts,
+                error=str(fetched.error),
+                http_status=fetched.status
+            )
+        return None
+
     def convert(self) -> MiniManga:
         """Конвертирует в маленькую версию
 
@@ -100,7 +126,7 @@ class BaseManga(Manga, ABC):
 @dataclass
 class WorkManga(BaseManga):
     """Хранит полную ифнормацию об тайтле"""
-    def download(self, path: Path | str, session, *, max_workers: int = 5):
+    def download(self, path: Path | str, session, *, max_workers: int = 5, fail_fast: bool = False) -> DownloadReport:
         if isinstance(session, BaseHttpManager):
             ...
         elif is_async(session.request):
@@ -108,30 +134,79 @@ class WorkManga(BaseManga):
         
         path = Path(path)
         http = BaseHttpManager(session)
+        cancel = threading.Event()
+        started = time.monotonic()
         
         path.mkdir(parents=True, exist_ok=True)
         
         tasks = self._make_tasks(path, http)
+        if http._hedger is not None:
+            http._hedger.reserve(max_workers)
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            executor.map(lambda x: self._download_img(*x), tasks)
+            futures = [
+                executor.submit(self._download_img, url, file_path, http, cancel=cancel)
+                for url, file_path, http in tasks
+            ]
+            pages = dict(zip(futures, tasks))
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                url, file_path, _ = pages[future]
+                if self._page_result(future, url, file_path).status is not PageStatus.FAILED:
+                    continue
+                if fail_fast and not cancel.is_set():
+                    logger.error(f"Не удалось скачать {url}, отмена оставшихся страниц")
+                    cancel.set()
+                    for other in futures:
+                        other.cancel()
+        
+        report = DownloadReport(
+            [
+                PageResult(url, file_path, PageStatus.CANCELLED) if future.cancelled() else self._page_result(future, url, file_path)
+                for (url, file_path, _), future in zip(tasks, futures)
+            ],
+            time.monotonic() - started
+        )
+        logger.info(f"Скачивание {self.title} завершено: {report}")
+        return report
+    
+    @staticmethod
+    def _page_result(future: Future, url: str, path: Path) -> PageResult:
+        """Достаёт результат страницы, неожиданная ошибка превращается в FAILED"""
+        if (error := future.exception()) is None:
+            return future.result()
+        return PageResult(url, path, PageStatus.FAILED, error=str(error))
             
-    def _download_img(self, url, path, session, *, max_try = config.MAX_TRY):
+    def _download_img(self, url, path, session, *, max_try = config.MAX_TRY, cancel: threading.Event = None):
         logger.debug(f"Попытка скачать файл: {url}, по пути: {path} максимальное количество попыток: {max_try}")
         if os.path.exists(path):
             logger.warning(f"Объект: {path} уже существует")
-            return
+            return PageResult(url, path, PageStatus.SKIPPED)
         
-        with open(path, 'wb') as f:
-            for try_num in range(1, max_try + 1):
-                logger.debug(f"{try_num}. Попытка скачать: {url}")
-                try:
-                    f.write(session._sync_get_content(url, headers = {}))
-                    return
-                except Exception as e:
-                    logger.warning(f"{try_num}. Ошибка при попытке скачать {url}: {e}")
-                    
-            logger.critical(f"Не получилось скачать: {url}")
-            raise HTTPError(f"Не удалось скачать файл: {url}")
+        started = time.monotonic()
+        fetched = session._sync_get_image(url, max_try=max_try, cancel=cancel)
+        if (result := self._fetch_result(url, path, fetched, started)) is not None:
+            return result
+        
+        try:
+            self._write_file(path, fetched.content)
+        except OSError as e:
+            logger.error(f"Не удалось записать {path}: {e}")
+            return PageResult(url, path, PageStatus.FAILED, duration=time.monotonic() - started, attempts=fetched.attempts, error=str(e))
+        return PageResult(url, path, PageStatus.OK, len(fetched.content), time.monotonic() - started, fetched.attempts)
+    
+    @staticmethod
+    def _write_file(path: Path, content: bytes) -> None:
+        """Пишет во временный файл и переносит его на место, что-бы не оставлять обрезанных файлов"""
+        tmp_path = path.with_name(path.name + ".part")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
     
     def _make_tasks(self, path: Path, http: BaseHttpManager):
         """Вспомогательная функция что-бы создать задачи"""
@@ -154,7 +229,7 @@ class AsyncWorkManga(BaseManga):
         semaphore: asyncio.Semaphore,
         *,
         max_try = config.MAX_TRY
-    ):
+    ) -> PageResult:
         """Скачивает фотографию
 
         Args:
@@ -163,25 +238,43 @@ class AsyncWorkManga(BaseManga):
             max_try (int): Максимальное количество попыток
             session (BaseHttpManager): HttpManager для скачивание
             semaphore (asyncio.Semaphore): semaphore для ограничение потоков
+
+        Returns:
+            PageResult: Результат скачивания, ошибки не выбрасываются а попадают в результат
         """
         logger.debug(f"Попытка скачать файл: {url}, по пути: {path} максимальное количество попыток: {max_try}")
         if os.path.exists(path):
             logger.warning(f"Объект: '{path}' уже существует")
-            return
+            return PageResult(url, path, PageStatus.SKIPPED)
         
         async with semaphore:
-            async with aiofiles.open(path, 'wb') as f:
-                for try_num in range(1, max_try + 1):
-                    logger.debug(f"{try_num}. Попытка скачать: {url}")
-                    try:
-                        await f.write(await session._async_get_content(url))
-                        return
-                    except Exception as e:
-                        logger.warning(f"{try_num}. Ошибка при попытке скачать {url}: {e}")
-            logger.critical(f"Не получилось скачать: {url}")
-            raise HTTPError(f"Не удалось скачать файл: {url}")
+            started = time.monotonic()
+            fetched = await session._async_get_image(url, max_try=max_try)
+            if (result := self._fetch_result(url, path, fetched, started)) is not None:
+                return result
+            
+            try:
+                # Уже скачанное изображение дописывается даже при отмене страницы
+                await asyncio.shield(self._write_file(path, fetched.content))
+            except OSError as e:
+                logger.error(f"Не удалось записать {path}: {e}")
+                return PageResult(url, path, PageStatus.FAILED, duration=time.monotonic() - started, attempts=fetched.attempts, error=str(e))
+            return PageResult(url, path, PageStatus.OK, len(fetched.content), time.monotonic() - started, fetched.attempts)
+    
+    @staticmethod
+    async def _write_file(path: Path, content: bytes) -> None:
+        """Пишет во временный файл и переносит его на место, что-бы не оставлять обрезанных файлов"""
+        tmp_path = path.with_name(path.name + ".part")
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                await f.write(content)
+            await aiofiles.os.replace(tmp_path, path)
+        except BaseException:
+            if await aiofiles.os.path.exists(tmp_path):
+                await aiofiles.os.remove(tmp_path)
+            raise
     
-    async def download(self, path, session, *, max_workers = 5):
+    async def download(self, path, session, *, max_workers = 5, fail_fast = False):
         if isinstance(session, BaseHttpManager):
             ...
         elif not is_async(session.request):
@@ -190,29 +283,62 @@ class AsyncWorkManga(BaseManga):
         path = Path(path)
         http = BaseHttpManager(session)
         semaphore = asyncio.Semaphore(max_workers)
+        started = time.monotonic()
         
         path.mkdir(parents=True, exist_ok=True)
         
-        await asyncio.gather(
-            *self._make_tasks(path, http, semaphore)
+        paths = self._make_paths(path)
+        tasks = self._make_tasks(paths, http, semaphore)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result = await next_done
+                except Exception as e:
+                    result = PageResult(None, None, PageStatus.FAILED, error=str(e))
+                if fail_fast and result.status is PageStatus.FAILED:
+                    logger.error(f"Не удалось скачать {result.url}, отмена оставшихся страниц")
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        report = DownloadReport(
+            [
+                self._page_result(result, url, file_path)
+                for (url, file_path), result in zip(paths, results)
+            ],
+            time.monotonic() - started
         )
+        logger.info(f"Скачивание {self.title} завершено: {report}")
+        return report
+    
+    @staticmethod
+    def _page_result(result: PageResult | BaseException, url: str, path: Path) -> PageResult:
+        """Превращает результат gather в PageResult"""
+        if isinstance(result, asyncio.CancelledError):
+            return PageResult(url, path, PageStatus.CANCELLED)
+        if isinstance(result, BaseException):
+            return PageResult(url, path, PageStatus.FAILED, error=str(result))
+        return result
+    
+    def _make_paths(self, path: Path) -> List[tuple[str, Path]]:
+        """Вспомогательная функция что-бы получить пути к файлам"""
+        paths = []
+        for img_url in self.gallery:
+            if not (name := self._get_name(img_url)):
+                logger.warning(f"{img_url} не является файлом")
+                continue
+            paths.append((img_url, path / name))
+        return paths
         
     def _make_tasks(
         self,
-        path: Path | str,
+        paths: List[tuple[str, Path]],
         session: BaseHttpManager,
         semaphore: asyncio.Semaphore
-    ) -> List[Awaitable]:
-        tasks = []
-        for img_url in self.gallery:
-            if not (name := self._get_name(img_url)):
-                logger.warning(f"{img_url} не является файлом")
-                continue
-            
-            file_path = path / name
-            tasks.append(
-                asyncio.create_task(
-                    self._download_img(img_url, file_path, session, semaphore)
-                )
-            )
-        return tasks
\ No newline at end of file
+    ) -> List[asyncio.Task]:
+        return [
+            asyncio.create_task(self._download_img(img_url, file_path, session, semaphore))
+            for img_url, file_path in paths
+        ]
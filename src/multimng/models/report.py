@@ -0,0 +1,74 @@
+__all__ = [
+    "PageStatus",
+    "PageResult",
+    "DownloadReport",
+]
+
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import List, Optional
+
+
+class PageStatus(str, Enum):
+    """Итог скачивания одной страницы"""
+    OK = "ok"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class PageResult:
+    """Результат скачивания одной страницы"""
+    url: str
+    path: Path
+    status: PageStatus
+
+    bytes: int = field(default=0)
+    duration: float = field(default=0.0)
+    attempts: int = field(default=0)
+    error: Optional[str] = field(default=None)
+    http_status: Optional[int] = field(default=None)
+
+
+@dataclass
+class DownloadReport:
+    """Отчёт о скачивании галереи"""
+    pages: List[PageResult] = field(default_factory=list)
+    duration: float = field(default=0.0)
+
+    def _with_status(self, status: PageStatus) -> List[PageResult]:
+        return [page for page in self.pages if page.status is status]
+
+    @property
+    def ok(self) -> List[PageResult]:
+        return self._with_status(PageStatus.OK)
+
+    @property
+    def skipped(self) -> List[PageResult]:
+        return self._with_status(PageStatus.SKIPPED)
+
+    @property
+    def failed(self) -> List[PageResult]:
+        return self._with_status(PageStatus.FAILED)
+
+    @property
+    def cancelled(self) -> List[PageResult]:
+        return self._with_status(PageStatus.CANCELLED)
+
+    @property
+    def bytes(self) -> int:
+        return sum(page.bytes for page in self.pages)
+
+    @property
+    def success(self) -> bool:
+        """True если все страницы скачаны или уже существовали"""
+        return not (self.failed or self.cancelled)
+
+    def __str__(self) -> str:
+        return (
+            f"страниц {len(self.pages)}: скачано {len(self.ok)}, пропущено {len(self.skipped)}, "
+            f"ошибок {len(self.failed)}, отменено {len(self.cancelled)}; "
+            f"{self.bytes} байт за {self.duration:.2f} с"
+        )
@@ -1,9 +1,13 @@
 __all__ = [
     "MangaManager",
-    "AsyncMangaManager"
+    "AsyncMangaManager",
+    "MangaGateway",
+    "PageCache"
 ]
 
 from .manga_service import (
     AsyncMangaManager,
     MangaManager
-)
\ No newline at end of file
+)
+from .cache import PageCache
+from .gateway import MangaGateway
@@ -0,0 +1,152 @@
+__all__ = [
+    "PageCache"
+]
+
+import os
+import re
+
+from collections import OrderedDict
+from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+
+from ..config import config
+
+logger = config.logger(__name__)
+
+_UNSAFE = re.compile(r"[^\w.-]")
+_TMP_SUFFIX = ".part"
+
+
+class PageCache:
+    """LRU кэш страниц в памяти и на диске с ограничением по размеру.
+
+    Args:
+        directory (Path | str, optional): Директория для дискового кэша, без неё кэш только в памяти
+        memory_limit (int): Максимальный размер кэша в памяти (байт)
+        disk_limit (int): Максимальный размер кэша на диске (байт)
+    """
+    def __init__(
+        self,
+        directory: Path | str | None = None,
+        *,
+        memory_limit: int = 64 * 1024 * 1024,
+        disk_limit: int = 1024 * 1024 * 1024
+    ):
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_size = 0
+        self._memory_limit = memory_limit
+
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_size = 0
+        self._disk_limit = disk_limit
+        self._directory = Path(directory) if directory else None
+
+        if self._directory is not None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            self._load_index()
+
+    def _load_index(self) -> None:
+        """Восстанавливает индекс дискового кэша, порядок LRU по времени доступа"""
+        files = []
+        for entry in os.scandir(self._directory):
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(_TMP_SUFFIX):
+                # Недописанный файл после падения процесса
+                self._remove(entry.name)
+                continue
+            files.append(entry)
+        files.sort(key=lambda entry: entry.stat().st_atime)
+        for entry in files:
+            size = entry.stat().st_size
+            self._disk[entry.name] = size
+            self._disk_size += size
+        logger.debug(f"Загружено {len(self._disk)} файлов кэша ({self._disk_size} байт)")
+        self._evict_disk()
+
+    @staticmethod
+    def _file_name(key: str) -> str:
+        name = _UNSAFE.sub("_", key)
+        # Имя не должно совпадать с временными файлами
+        return name + "_" if name.endswith(_TMP_SUFFIX) else name
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or self._file_name(key) in self._disk
+
+    async def get(self, key: str) -> bytes | None:
+        if (data := self._memory.get(key)) is not None:
+            self._memory.move_to_end(key)
+            return data
+
+        name = self._file_name(key)
+        if self._directory is None or name not in self._disk:
+            return None
+
+        try:
+            async with aiofiles.open(self._directory / name, 'rb') as f:
+                data = await f.read()
+        except OSError as e:
+            logger.warning(f"Не удалось прочитать кэш {name}: {e}")
+            self._disk_size -= self._disk.pop(name, 0)
+            return None
+
+        self._disk.move_to_end(name)
+        self._put_memory(key, data)
+        return data
+
+    async def put(self, key: str, data: bytes) -> None:
+        """Кладёт страницу в кэш. Ошибка записи на диск не выбрасывается:
+        страница уже в памяти, а кэш не должен ломать отдачу страниц"""
+        self._put_memory(key, data)
+        if self._directory is None or len(data) > self._disk_limit:
+            return
+
+        name = self._file_name(key)
+        if name in self._disk:
+            self._disk.move_to_end(name)
+            return
+
+        # Пишем во временный файл, что-бы после падения в кэше не осталось обрезанных страниц
+        tmp_path = self._directory / (name + _TMP_SUFFIX)
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                await f.write(data)
+            await aiofiles.os.replace(tmp_path, self._directory / name)
+        except OSError as e:
+            self._remove(tmp_path.name)
+            logger.warning(f"Не удалось записать кэш {name}: {e}")
+            return
+        except BaseException:
+            self._remove(tmp_path.name)
+            raise
+        self._disk[name] = len(data)
+        self._disk_size += len(data)
+        self._evict_disk()
+
+    def _put_memory(self, key: str, data: bytes) -> None:
+        if len(data) > self._memory_limit:
+            return
+        if (old := self._memory.pop(key, None)) is not None:
+            self._memory_size -= len(old)
+
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self._memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _evict_disk(self) -> None:
+        while self._disk_size > self._disk_limit:
+            name, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            self._remove(name)
+
+    def _remove(self, name: str) -> None:
+        try:
+            os.remove(self._directory / name)
+        except FileNotFoundError:
+            ...
+        except OSError as e:
+            logger.warning(f"Не удалось удалить кэш {name}: {e}")
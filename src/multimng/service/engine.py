@@ -0,0 +1,73 @@
+__all__ = [
+    "LoopThread"
+]
+
+import asyncio
+import threading
+
+from typing import Any, Coroutine, TypeVar
+
+from ..config import config
+
+logger = config.logger(__name__)
+
+T = TypeVar('T')
+
+
+class LoopThread:
+    """Event loop в отдельном фоновом потоке.
+
+    Позволяет синхронному коду выполнять корутины: `run` блокирует
+    вызывающий поток до завершения корутины на этом loop'е.
+    """
+    def __init__(self, name: str = "multimng-loop"):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def _run_forever(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Выполняет корутину на фоновом loop'е и возвращает результат
+
+        Args:
+            coro (Coroutine): Корутина для выполнения
+
+        Returns:
+            T: Результат корутины
+        """
+        if self._loop.is_closed() or threading.current_thread() is self._thread:
+            # Корутина уже создана, закрываем её что-бы не было "coroutine was never awaited"
+            coro.close()
+            if self._loop.is_closed():
+                raise RuntimeError("Event loop уже закрыт")
+            raise RuntimeError("Нельзя вызывать run из потока самого event loop")
+
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    def close(self) -> None:
+        """Отменяет оставшиеся задачи и останавливает loop"""
+        if self._loop.is_closed():
+            return
+        self.run(self._cancel_pending())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    @staticmethod
+    async def _cancel_pending() -> None:
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,249 @@
+__all__ = [
+    "MangaGateway"
+]
+
+import asyncio
+import itertools
+import json
+import mimetypes
+
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Callable, Dict, Tuple
+
+from .cache import PageCache
+from ..models import AsyncWorkManga
+from ..config import config
+
+if TYPE_CHECKING:
+    from .. import AsyncMultiManga
+
+logger = config.logger(__name__)
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    502: "Bad Gateway",
+}
+
+
+class _NotFound(Exception):
+    """Запрошенной страницы не существует"""
+
+
+class MangaGateway:
+    """Локальный HTTP шлюз: отдаёт страницы тайтла по `/{id}/{page}`.
+
+    Страницы скачиваются по запросу, следующие `prefetch` страниц открытого
+    тайтла загружаются заранее (ближайшие первыми), всё складывается в `PageCache`.
+    `GET /{id}` возвращает информацию о тайтле в JSON.
+
+    Args:
+        api (AsyncMultiManga): Клиент через который идут запросы
+        cache (PageCache, optional): Кэш страниц, по умолчанию только в памяти
+        prefetch (int): Сколько следующих страниц загружать заранее
+        workers (int): Количество фоновых загрузчиков
+        resolve_url (Callable[[str], str], optional): Превращает id тайтла в URL,
+            по умолчанию `{base_url}/index.php?newsid={id}`
+        max_galleries (int): Сколько тайтлов держать в памяти
+    """
+    def __init__(
+        self,
+        api: "AsyncMultiManga",
+        *,
+        cache: PageCache | None = None,
+        prefetch: int = 5,
+        workers: int = 4,
+        resolve_url: Callable[[str], str] | None = None,
+        max_galleries: int = 128
+    ):
+        self._api = api
+        self._cache = cache if cache is not None else PageCache()
+        self._prefetch = prefetch
+        self._workers_count = workers
+        self._resolve_url = resolve_url if resolve_url else self._default_resolve_url
+        self._max_galleries = max_galleries
+
+        self._galleries: OrderedDict[str, asyncio.Future] = OrderedDict()
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._queue: asyncio.PriorityQueue | None = None
+        self._queued: Dict[Tuple[str, int], int] = {}
+        self._counter = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._server: asyncio.AbstractServer | None = None
+
+    def _default_resolve_url(self, manga_id: str) -> str:
+        return f"{self._api._base_url.rstrip('/')}/index.php?newsid={manga_id}"
+
+    async def get_manga(self, manga_id: str) -> AsyncWorkManga:
+        """Возвращает информацию о тайтле, запрашивая её один раз"""
+        if (future := self._galleries.get(manga_id)) is not None:
+            self._galleries.move_to_end(manga_id)
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(self._api.get_info(self._resolve_url(manga_id)))
+        self._galleries[manga_id] = future
+        while len(self._galleries) > self._max_galleries:
+            self._galleries.popitem(last=False)
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            self._galleries.pop(manga_id, None)
+            raise
+
+    async def get_page(self, manga_id: str, page: int) -> Tuple[bytes, str]:
+        """Возвращает страницу (нумерация с 1) и её Content-Type, планируя предзагрузку следующих"""
+        manga = await self.get_manga(manga_id)
+        if not 1 <= page <= len(manga.gallery):
+            raise _NotFound(f"В тайтле {manga_id} нет страницы {page}")
+
+        self._schedule_prefetch(manga_id, page, len(manga.gallery))
+        data = await self._fetch(manga_id, page, manga.gallery[page - 1])
+        content_type = mimetypes.guess_type(manga.gallery[page - 1])[0] or "application/octet-stream"
+        return data, content_type
+
+    async def _fetch(self, manga_id: str, page: int, url: str) -> bytes:
+        key = (manga_id, page)
+        if (data := await self._cache.get(f"{manga_id}-{page}")) is not None:
+            return data
+
+        if (future := self._inflight.get(key)) is None:
+            future = asyncio.ensure_future(self._download(manga_id, page, url))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._download_done(key, done))
+        return await asyncio.shield(future)
+
+    def _download_done(self, key: Tuple[str, int], future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        # Забираем ошибку, иначе при отменённых ожидающих asyncio пишет "exception was never retrieved"
+        if not future.cancelled() and (error := future.exception()) is not None:
+            logger.debug(f"Не удалось загрузить страницу {key[1]} тайтла {key[0]}: {error}")
+
+    async def _download(self, manga_id: str, page: int, url: str) -> bytes:
+        logger.debug(f"Загрузка страницы {page} тайтла {manga_id}: {url}")
+        data = await self._api.get_image(url)
+        await self._cache.put(f"{manga_id}-{page}", data)
+        return data
+
+    def _schedule_prefetch(self, manga_id: str, page: int, total: int) -> None:
+        if self._queue is None:
+            return
+        # Свежий запрос важнее старых, внутри него ближайшие страницы важнее дальних
+        generation = -next(self._counter)
+        window = range(page + 1, min(page + self._prefetch, total) + 1)
+
+        # Читатель ушёл дальше: старые задачи этого тайтла вне нового окна больше не нужны
+        for key in [key for key in self._queued if key[0] == manga_id and key[1] not in window]:
+            del self._queued[key]
+
+        for distance, next_page in enumerate(window, start=1):
+            key = (manga_id, next_page)
+            if key in self._inflight or f"{manga_id}-{next_page}" in self._cache:
+                continue
+            self._queued[key] = generation
+            self._queue.put_nowait((distance, generation, manga_id, next_page))
+
+    async def _prefetch_worker(self) -> None:
+        while True:
+            _, generation, manga_id, page = await self._queue.get()
+            try:
+                if self._queued.get((manga_id, page)) != generation:
+                    # Задача устарела: её отменили или перепланировали с новым приоритетом
+                    continue
+                del self._queued[(manga_id, page)]
+                manga = await self.get_manga(manga_id)
+                await self._fetch(manga_id, page, manga.gallery[page - 1])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Не удалось предзагрузить страницу {page} тайтла {manga_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while request_line := await reader.readline():
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    ...
+                keep_alive = await self._respond(request_line.decode("latin-1").split(), writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            ...
+        finally:
+            writer.close()
+
+    async def _respond(self, request: list[str], writer: asyncio.StreamWriter) -> bool:
+        if len(request) != 3:
+            self._write(writer, 400, b"", "text/plain", False)
+            return False
+
+        method, target, version = request
+        keep_alive = version == "HTTP/1.1"
+        if method not in ("GET", "HEAD"):
+            self._write(writer, 405, b"", "text/plain", keep_alive)
+            return keep_alive
+
+        parts = [part for part in target.split("?")[0].split("/") if part]
+        try:
+            if len(parts) == 1 and parts[0].isdigit():
+                manga = await self.get_manga(parts[0])
+                body, content_type = json.dumps(asdict(manga), ensure_ascii=False).encode(), "application/json"
+            elif len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+                body, content_type = await self.get_page(parts[0], int(parts[1]))
+            else:
+                raise _NotFound(target)
+        except _NotFound as e:
+            body, content_type, status = str(e).encode(), "text/plain; charset=utf-8", 404
+        except Exception as e:
+            logger.warning(f"Ошибка при обработке {target}: {e}")
+            body, content_type, status = str(e).encode(), "text/plain; charset=utf-8", 502
+        else:
+            status = 200
+
+        self._write(writer, status, b"" if method == "HEAD" else body, content_type, keep_alive, len(body))
+        return keep_alive
+
+    @staticmethod
+    def _write(
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        content_type: str,
+        keep_alive: bool,
+        length: int | None = None
+    ) -> None:
+        head = (
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body) if length is None else length}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """Запускает HTTP сервер и фоновые загрузчики"""
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [asyncio.create_task(self._prefetch_worker()) for _ in range(self._workers_count)]
+        self._server = await asyncio.start_server(self._handle, host, port)
+        logger.info(f"Шлюз запущен на http://{host}:{port}")
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        await self.start(host, port)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
@@ -2,8 +2,8 @@ from pathlib import Path
 from abc import ABC, abstractmethod
 from typing import Union
 
-from .._http import HasRequest, BaseHttpManager
-from ..models import AsyncWorkManga, WorkManga
+from .._http import HasRequest, BaseHttpManager, RateLimiter, Hedger, HTTPError
+from ..models import AsyncWorkManga, WorkManga, DownloadReport
 from ..models.entites import BaseManga
 from ..core.mngparser import BaseMangaParser, MangaParser
 from ..config import config
@@ -18,6 +18,8 @@ class BaseManager(ABC):
         max_try: int = config.MAX_TRY,
         parser: BaseMangaParser = None,
         base_url: str = config.BASE_URL,
+        rate_limiter: RateLimiter = None,
+        hedger: Hedger = None,
     ):
         if parser is None:
             self._parser = MangaParser(base_url=base_url)
@@ -28,8 +30,17 @@ class BaseManager(ABC):
             raise TypeError(f"Неподдерживаемый класс парсера: {type(parser).__name__}")
         
         self._max_workers = max_workers
-        self._session = BaseHttpManager(session)
+        self._session = BaseHttpManager(session, rate_limiter, hedger)
         self._max_try = max_try
+    
+    def _log_hedge_stats(self) -> None:
+        if (hedger := self._session._hedger) is None:
+            return
+        stats = hedger.stats
+        logger.info(
+            f"Hedging: запросов {stats.requests}, дублей {stats.hedged} ({stats.hedge_rate:.1%}), "
+            f"дубль быстрее {stats.wins} ({stats.win_rate:.1%})"
+        )
         
     @abstractmethod
     def get_info(self, url: str) -> BaseManga:
@@ -43,12 +54,16 @@ class BaseManager(ABC):
         """
         
     @abstractmethod
-    def download(self, manga: BaseManga, path: Path | str) -> None:
+    def download(self, manga: BaseManga, path: Path | str, *, fail_fast: bool = False) -> DownloadReport:
         """Скачивает мангу
 
         Args:
             manga (BaseManga): Непосредственно сама манга
             path (Path | str): Директория для скачивания файла
+            fail_fast (bool): Отменить оставшиеся страницы после первой неудачной
+
+        Returns:
+            DownloadReport: Отчёт по каждой странице
         """
 
 
@@ -59,14 +74,20 @@ class MangaManager(BaseManager):
         response = self._session._sync_get_content(url, headers={})
         return self._parser.parse_manga(response, 'sync')
     
-    def download(self, manga: WorkManga, path: Path | str) -> None:
+    def download(self, manga: WorkManga, path: Path | str, *, fail_fast: bool = False) -> DownloadReport:
         """Скачивает всю галерею из gallery
 
         Args:
             manga (WorkManga): Непосредственно сама манга
             path (Path | str): Директория для скачивания файла
+            fail_fast (bool): Отменить оставшиеся страницы после первой неудачной
+
+        Returns:
+            DownloadReport: Отчёт по каждой странице
         """
-        manga.download(path, self._session, max_workers=self._max_workers)
+        report = manga.download(path, self._session, max_workers=self._max_workers, fail_fast=fail_fast)
+        self._log_hedge_stats()
+        return report
 
 
 class AsyncMangaManager(BaseManager):
@@ -76,11 +97,31 @@ class AsyncMangaManager(BaseManager):
         response = await self._session._async_get_content(url, headers={})
         return self._parser.parse_manga(response, 'async')
     
-    async def download(self, manga: AsyncWorkManga, path: Path | str) -> None:
+    async def get_image(self, url: str) -> bytes:
+        """Скачивает одно изображение
+
+        Args:
+            url (str): URL изображения
+
+        Returns:
+            bytes: Содержимое изображения
+        """
+        fetched = await self._session._async_get_image(url, max_try=self._max_try)
+        if fetched.content is None:
+            raise fetched.error if fetched.error is not None else HTTPError(f"Не удалось скачать файл: {url}")
+        return fetched.content
+    
+    async def download(self, manga: AsyncWorkManga, path: Path | str, *, fail_fast: bool = False) -> DownloadReport:
         """Скачивает всю галерею из gallery
 
         Args:
             manga (AsyncWorkManga): Непосредственно сама манга
             path (Path | str): Директория для скачивания файла
+            fail_fast (bool): Отменить оставшиеся страницы после первой неудачной
+
+        Returns:
+            DownloadReport: Отчёт по каждой странице
         """
-        await manga.download(path, self._session, max_workers=self._max_workers)
\ No newline at end of file
+        report = await manga.download(path, self._session, max_workers=self._max_workers, fail_fast=fail_fast)
+        self._log_hedge_stats()
+        return report
\ No newline at end of file
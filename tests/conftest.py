@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import pytest
+
+from multimng.models import AsyncWorkManga, WorkManga
+
+
+class StubResponse:
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.content = content
+        self.status_code = status_code
+
+
+class StubSession:
+    """Синхронная сессия: страницы из `missing` отвечают 404, из `broken` — ошибкой соединения"""
+    def __init__(self, delay: float = 0.0, missing: set = (), broken: set = ()):
+        self.delay = delay
+        self.missing = set(missing)
+        self.broken = set(broken)
+        self.calls = []
+
+    def _respond(self, url: str) -> StubResponse:
+        self.calls.append(url)
+        name = url.rsplit("/", 1)[-1]
+        if name in self.broken:
+            raise ConnectionError(f"Соединение сброшено: {url}")
+        if name in self.missing:
+            return StubResponse(b"", 404)
+        return StubResponse(url.encode())
+
+    def request(self, method, url, headers):
+        time.sleep(self.delay)
+        return self._respond(url)
+
+
+class AsyncStubSession(StubSession):
+    async def request(self, method, url, headers):
+        await asyncio.sleep(self.delay)
+        return self._respond(url)
+
+
+def make_gallery(pages: int) -> dict:
+    return dict(
+        title="Тайтл",
+        url="https://multi-manga.today/1-title.html",
+        poster="https://multi-manga.today/poster.jpg",
+        gallery=[f"https://img.host/g/{n}.jpg" for n in range(1, pages + 1)],
+    )
+
+
+@pytest.fixture
+def manga() -> WorkManga:
+    return WorkManga(**make_gallery(10))
+
+
+@pytest.fixture
+def async_manga() -> AsyncWorkManga:
+    return AsyncWorkManga(**make_gallery(10))
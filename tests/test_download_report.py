@@ -0,0 +1,97 @@
+import asyncio
+import errno
+import os
+
+import pytest
+
+from multimng.models import PageStatus
+
+from conftest import AsyncStubSession, StubSession
+
+
+def statuses(report) -> dict:
+    return {page.url.rsplit("/", 1)[-1]: page.status for page in report.pages}
+
+
+def test_report_lists_every_page(manga, tmp_path):
+    (tmp_path / "1.jpg").write_bytes(b"old")
+    session = StubSession(missing={"2.jpg"}, broken={"3.jpg"})
+
+    report = manga.download(tmp_path, session, max_workers=4)
+    pages = statuses(report)
+
+    assert pages["1.jpg"] is PageStatus.SKIPPED
+    assert pages["2.jpg"] is PageStatus.FAILED
+    assert pages["3.jpg"] is PageStatus.FAILED
+    assert len(report.ok) == 7
+    assert not report.success
+    assert report.bytes == sum(len(page.url) for page in report.ok)
+
+
+def test_retries_only_retryable_errors(manga, tmp_path):
+    session = StubSession(missing={"2.jpg"}, broken={"3.jpg"})
+
+    report = manga.download(tmp_path, session, max_workers=4)
+    failed = {page.url.rsplit("/", 1)[-1]: page for page in report.failed}
+
+    assert failed["2.jpg"].attempts == 1
+    assert failed["2.jpg"].http_status == 404
+    assert failed["3.jpg"].attempts == 3
+    assert failed["3.jpg"].http_status is None
+    assert not (tmp_path / "2.jpg").exists()
+
+
+def test_fail_fast_cancels_remaining_pages(manga, tmp_path):
+    session = StubSession(delay=0.05, missing={"1.jpg"})
+
+    report = manga.download(tmp_path, session, max_workers=1, fail_fast=True)
+
+    assert statuses(report)["1.jpg"] is PageStatus.FAILED
+    assert len(report.cancelled) >= 8
+    assert len(session.calls) <= 2
+
+
+def test_write_error_is_recorded(manga, tmp_path, monkeypatch):
+    real_open = open
+
+    def failing_open(path, *args, **kwargs):
+        if str(path).endswith("4.jpg.part"):
+            raise OSError(errno.ENOSPC, "No space left on device")
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", failing_open)
+    report = manga.download(tmp_path, StubSession(), max_workers=4)
+
+    assert statuses(report)["4.jpg"] is PageStatus.FAILED
+    assert "No space left" in report.failed[0].error
+    assert len(report.ok) == 9
+    assert not any(name.endswith(".part") for name in os.listdir(tmp_path))
+
+
+def test_async_report_lists_every_page(async_manga, tmp_path):
+    session = AsyncStubSession(missing={"2.jpg"})
+
+    report = asyncio.run(async_manga.download(tmp_path, session, max_workers=4))
+
+    assert statuses(report)["2.jpg"] is PageStatus.FAILED
+    assert len(report.ok) == 9
+    assert (tmp_path / "5.jpg").read_bytes() == b"https://img.host/g/5.jpg"
+
+
+def test_async_fail_fast_cancels_remaining_pages(async_manga, tmp_path):
+    session = AsyncStubSession(delay=0.05, missing={"1.jpg"})
+
+    report = asyncio.run(async_manga.download(tmp_path, session, max_workers=1, fail_fast=True))
+
+    assert statuses(report)["1.jpg"] is PageStatus.FAILED
+    assert len(report.cancelled) >= 8
+    assert len(session.calls) <= 2
+
+
+@pytest.mark.parametrize("fail_fast", [False, True])
+def test_successful_download(manga, tmp_path, fail_fast):
+    report = manga.download(tmp_path, StubSession(), max_workers=4, fail_fast=fail_fast)
+
+    assert report.success
+    assert len(report.ok) == 10
+    assert all(page.attempts == 1 for page in report.ok)
@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from multimng import MultiManga, DownloadReport
+from multimng.models import WorkManga
+from multimng.service.engine import LoopThread
+
+from conftest import AsyncStubSession, StubResponse, StubSession
+
+BASE_URL = "https://multi-manga.today"
+
+HTML = """<html><head><link rel="canonical" href="{base}/1-title.html"></head><body>
+<h1>Тайтл</h1>
+<div id="cover"><img data-src="https://img.host/g/0.jpg"></div>
+<div id="thumbnail-container">{images}</div>
+</body></html>"""
+
+
+class GallerySession(AsyncStubSession):
+    """Асинхронная сессия, которая отдаёт HTML галереи из 5 страниц и считает закрытия"""
+    closed = 0
+
+    def _respond(self, url: str) -> StubResponse:
+        if url.endswith(".html"):
+            images = "".join(f'<img data-src="https://img.host/g/{n}.jpg">' for n in range(1, 6))
+            return StubResponse(HTML.format(base=BASE_URL, images=images).encode())
+        return super()._respond(url)
+
+    async def close(self) -> None:
+        type(self).closed += 1
+
+
+@pytest.fixture(autouse=True)
+def reset_closed():
+    GallerySession.closed = 0
+
+
+def loop_threads() -> list:
+    return [thread for thread in threading.enumerate() if thread.name == "multimng-loop"]
+
+
+def test_async_engine_downloads(tmp_path):
+    session = GallerySession()
+    with MultiManga(session, base_url=BASE_URL, engine="async") as api:
+        manga = api.get_info(f"{BASE_URL}/1-title.html")
+        report = api.download_manga(manga, tmp_path)
+
+    assert isinstance(manga, WorkManga)
+    assert len(manga.gallery) == 5
+    assert isinstance(report, DownloadReport)
+    assert len(report.ok) == 5
+    assert (tmp_path / "3.jpg").read_bytes() == b"https://img.host/g/3.jpg"
+    # Переданную снаружи сессию закрывает её владелец
+    assert GallerySession.closed == 0
+    assert loop_threads() == []
+
+
+@pytest.mark.parametrize("factory", [GallerySession, lambda: GallerySession()])
+def test_factory_session_is_closed(factory):
+    api = MultiManga(factory, base_url=BASE_URL, engine="async")
+    assert isinstance(api._session, GallerySession)
+
+    with api:
+        api.get_info(f"{BASE_URL}/1-title.html")
+
+    assert GallerySession.closed == 1
+    api.close()
+    assert GallerySession.closed == 1
+
+
+def test_setup_failure_releases_loop_and_session():
+    class SyncSession(StubSession):
+        closed = 0
+
+        def close(self) -> None:
+            type(self).closed += 1
+
+    with pytest.raises(TypeError):
+        MultiManga(SyncSession, base_url=BASE_URL, engine="async")
+
+    assert SyncSession.closed == 1
+    assert loop_threads() == []
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        MultiManga(GallerySession(), engine="processes")
+
+
+def test_run_after_close_raises():
+    async def answer():
+        return 42
+
+    engine = LoopThread()
+    assert engine.run(answer()) == 42
+    engine.close()
+
+    with pytest.raises(RuntimeError):
+        engine.run(answer())
+    assert loop_threads() == []
+
+
+def test_client_after_close_raises():
+    api = MultiManga(GallerySession(), base_url=BASE_URL, engine="async")
+    api.close()
+
+    with pytest.raises(RuntimeError):
+        api.get_info(f"{BASE_URL}/1-title.html")
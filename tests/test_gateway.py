@@ -0,0 +1,120 @@
+import asyncio
+
+from multimng import PageCache
+from multimng.models import AsyncWorkManga
+from multimng.service import MangaGateway
+
+from conftest import make_gallery
+
+
+class StubApi:
+    """Заменяет AsyncMultiManga: галерея из 10 страниц, каждая грузится `delay` секунд"""
+    _base_url = "https://multi-manga.today"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.info_calls = 0
+        self.calls = []
+
+    async def get_info(self, url: str) -> AsyncWorkManga:
+        self.info_calls += 1
+        return AsyncWorkManga(**make_gallery(10))
+
+    async def get_image(self, url: str) -> bytes:
+        self.calls.append(int(url.rsplit("/", 1)[-1].split(".")[0]))
+        await asyncio.sleep(self.delay)
+        return url.encode()
+
+
+async def started(gateway: MangaGateway) -> MangaGateway:
+    await gateway.start(port=0)
+    return gateway
+
+
+async def request(gateway: MangaGateway, target: str) -> tuple[int, bytes]:
+    port = gateway._server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {target} HTTP/1.0\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b"\r\n\r\n", 1)
+    return int(head.split()[1]), body
+
+
+def test_prefetch_window_in_priority_order():
+    api = StubApi()
+
+    async def run():
+        gateway = await started(MangaGateway(api, prefetch=3, workers=1))
+        data, content_type = await gateway.get_page("1", 1)
+        await gateway._queue.join()
+        await gateway.close()
+        return data, content_type
+
+    assert asyncio.run(run()) == (b"https://img.host/g/1.jpg", "image/jpeg")
+    assert api.calls == [1, 2, 3, 4]
+    assert api.info_calls == 1
+
+
+def test_stale_prefetch_is_dropped_after_jump():
+    api = StubApi(delay=0.1)
+
+    async def run():
+        gateway = await started(MangaGateway(api, prefetch=3, workers=1))
+        first = asyncio.create_task(gateway.get_page("1", 1))
+        await asyncio.sleep(0.02)
+        # Воркер занят страницей 2, страницы 3 и 4 ещё в очереди
+        await gateway.get_page("1", 7)
+        await first
+        await gateway._queue.join()
+        await gateway.close()
+
+    asyncio.run(run())
+
+    assert 3 not in api.calls and 4 not in api.calls
+    assert sorted(api.calls) == [1, 2, 7, 8, 9, 10]
+
+
+def test_inflight_download_is_shared():
+    api = StubApi(delay=0.05)
+    gateway = MangaGateway(api)
+
+    async def run():
+        return await asyncio.gather(*(gateway.get_page("1", 2) for _ in range(5)))
+
+    assert len(set(asyncio.run(run()))) == 1
+    assert api.calls == [2]
+    assert gateway._inflight == {}
+
+
+def test_cached_page_is_not_downloaded_again():
+    api = StubApi()
+    gateway = MangaGateway(api, cache=PageCache())
+
+    async def run():
+        await gateway.get_page("1", 2)
+        await gateway.get_page("1", 2)
+
+    asyncio.run(run())
+
+    assert api.calls == [2]
+
+
+def test_http_responses():
+    api = StubApi()
+
+    async def run():
+        gateway = await started(MangaGateway(api, prefetch=0))
+        responses = {
+            target: await request(gateway, target)
+            for target in ("/1/3", "/1", "/1/0", "/1/11", "/abc", "/1/2/3")
+        }
+        await gateway.close()
+        return responses
+
+    responses = asyncio.run(run())
+
+    assert responses["/1/3"] == (200, b"https://img.host/g/3.jpg")
+    assert responses["/1"][0] == 200 and b'"gallery"' in responses["/1"][1]
+    for target in ("/1/0", "/1/11", "/abc", "/1/2/3"):
+        assert responses[target][0] == 404
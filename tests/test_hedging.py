@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from multimng import Hedger
+
+
+@pytest.fixture
+def hedger():
+    hedger = Hedger(initial_delay=0.05)
+    yield hedger
+    hedger.close()
+
+
+def sleeping(delay: float, result=None, error: Exception | None = None):
+    def call():
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+    return call
+
+
+def async_sleeping(delay: float, result=None, error: Exception | None = None):
+    async def call():
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+    return call
+
+
+def test_slow_primary_loses_to_hedge(hedger):
+    started = time.monotonic()
+
+    assert hedger.run_sync(sleeping(0.5, "primary"), sleeping(0, "hedge")) == "hedge"
+    assert time.monotonic() - started < 0.3
+    assert (hedger.stats.hedged, hedger.stats.wins) == (1, 1)
+
+
+def test_fast_primary_is_not_hedged(hedger):
+    calls = []
+
+    assert hedger.run_sync(sleeping(0, "primary"), lambda: calls.append("hedge")) == "primary"
+    time.sleep(0.1)
+    assert calls == []
+    assert hedger.stats.hedged == 0
+
+
+def test_failed_primary_falls_back_to_hedge(hedger):
+    result = hedger.run_sync(sleeping(0.1, error=ConnectionError("primary")), sleeping(0.2, "hedge"))
+
+    assert result == "hedge"
+    assert hedger.stats.wins == 1
+
+
+def test_error_when_both_fail(hedger):
+    with pytest.raises(ConnectionError):
+        hedger.run_sync(sleeping(0.1, error=ConnectionError("primary")), sleeping(0.15, error=ConnectionError("hedge")))
+
+
+def test_pool_resize_keeps_running_requests(hedger):
+    hedger.reserve(1)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(
+        hedger.run_sync(sleeping(0.5, "primary"), sleeping(0, "hedge"))
+    ))
+    thread.start()
+    time.sleep(0.02)
+    # Второй вызов download с большим max_workers увеличивает пул, пока первый запрос ещё идёт
+    hedger.reserve(10)
+    thread.join()
+
+    assert results == ["hedge"]
+
+
+def test_mirror_url_rotates():
+    hedger = Hedger({"img.host": ["https://m1.host", "http://m2.host"]})
+
+    assert [hedger.mirror_url("https://img.host/g/1.jpg") for _ in range(3)] == [
+        "https://m1.host/g/1.jpg",
+        "http://m2.host/g/1.jpg",
+        "https://m1.host/g/1.jpg",
+    ]
+    assert hedger.mirror_url("https://other.host/g/1.jpg") == "https://other.host/g/1.jpg"
+
+
+def test_async_slow_primary_is_cancelled(hedger):
+    cancelled = asyncio.Event()
+
+    async def primary():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def run():
+        result = await hedger.run_async(primary, async_sleeping(0, "hedge"))
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == "hedge"
+    assert cancelled.is_set()
+    assert hedger.stats.wins == 1
+
+
+def test_async_failed_primary_falls_back_to_hedge(hedger):
+    result = asyncio.run(hedger.run_async(
+        async_sleeping(0.1, error=ConnectionError("primary")),
+        async_sleeping(0.2, "hedge")
+    ))
+
+    assert result == "hedge"
+
+
+def test_stats_and_delay():
+    hedger = Hedger(initial_delay=0.05, min_samples=3)
+    try:
+        for _ in range(3):
+            hedger.run_sync(sleeping(0, "primary"), sleeping(0, "hedge"))
+        # После min_samples задержка считается по замерам, быстрые ответы дают почти нулевую
+        assert hedger.delay < 0.05
+
+        hedger.run_sync(sleeping(0.3, "primary"), sleeping(0, "hedge"))
+        hedger.run_sync(sleeping(0.05, "primary"), sleeping(0.3, "hedge"))
+    finally:
+        hedger.close()
+
+    assert (hedger.stats.requests, hedger.stats.hedged, hedger.stats.wins) == (5, 2, 1)
+    assert hedger.stats.hedge_rate == pytest.approx(0.4)
+    assert hedger.stats.win_rate == pytest.approx(0.5)
+
+
+def test_invalid_percentile():
+    with pytest.raises(ValueError):
+        Hedger(percentile=1)
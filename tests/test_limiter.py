@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import pytest
+
+from multimng import RateLimiter
+from multimng._http import TokenBucket
+
+
+def timed(func, *args) -> float:
+    started = time.monotonic()
+    func(*args)
+    return time.monotonic() - started
+
+
+def test_burst_is_free_then_rate_applies():
+    bucket = TokenBucket(20, burst=5)
+
+    assert timed(lambda: [bucket.acquire() for _ in range(5)]) < 0.05
+    # Ещё 4 токена при 20 в секунду — около 0.2 с
+    assert 0.15 < timed(lambda: [bucket.acquire() for _ in range(4)]) < 0.4
+
+
+def test_async_acquire_respects_rate():
+    bucket = TokenBucket(20, burst=1)
+
+    async def run():
+        await asyncio.gather(*(bucket.async_acquire() for _ in range(5)))
+
+    assert 0.15 < timed(asyncio.run, run()) < 0.4
+
+
+def test_state_dir_is_shared(tmp_path):
+    first = RateLimiter(20, 1, state_dir=tmp_path)
+    second = RateLimiter(20, 1, state_dir=tmp_path)
+
+    async def run():
+        await asyncio.gather(*(
+            (first if n % 2 else second).async_acquire("https://img.host/a.jpg")
+            for n in range(5)
+        ))
+
+    assert 0.15 < timed(asyncio.run, run()) < 0.5
+
+
+def test_html_and_image_hosts_use_separate_buckets():
+    limiter = RateLimiter(2, image_rate=100, base_url="https://multi-manga.today")
+
+    assert limiter.bucket("https://multi-manga.today/1-x.html").rate == 2
+    assert limiter.bucket("https://img.host/a.jpg").rate == 100
+    assert limiter.bucket("https://img.host/a.jpg") is not limiter.bucket("https://img2.host/a.jpg")
+
+
+def test_image_limits_without_host_raise():
+    with pytest.raises(ValueError):
+        RateLimiter(2, image_rate=100).bucket("https://img.host/a.jpg")
+
+
+def test_bind_fills_html_host():
+    limiter = RateLimiter(2, image_rate=100)
+    limiter.bind("https://multi-manga.today")
+
+    assert limiter.bucket("https://img.host/a.jpg").rate == 100
+    assert limiter.bucket("https://multi-manga.today/x").rate == 2
+
+
+@pytest.mark.parametrize("rate, burst", [(0, 1), (-1, 1), (1, 0)])
+def test_invalid_bucket(rate, burst):
+    with pytest.raises(ValueError):
+        TokenBucket(rate, burst)
@@ -0,0 +1,79 @@
+import asyncio
+import errno
+import os
+
+from multimng import PageCache
+
+
+def put_all(cache: PageCache, *items) -> None:
+    async def run():
+        for key, data in items:
+            await cache.put(key, data)
+    asyncio.run(run())
+
+
+def test_memory_eviction_respects_limit():
+    cache = PageCache(memory_limit=10)
+
+    put_all(cache, ("1-1", b"aaaa"), ("1-2", b"bbbb"))
+    # Обращение к 1-1 делает его свежим, вытесняться должен 1-2
+    assert asyncio.run(cache.get("1-1")) == b"aaaa"
+    put_all(cache, ("1-3", b"cccc"))
+
+    assert "1-2" not in cache
+    assert "1-1" in cache and "1-3" in cache
+    assert cache._memory_size <= 10
+
+
+def test_page_larger_than_memory_limit_is_not_kept():
+    cache = PageCache(memory_limit=3)
+    put_all(cache, ("1-1", b"aaaa"))
+
+    assert "1-1" not in cache
+
+
+def test_disk_eviction_respects_limit(tmp_path):
+    cache = PageCache(tmp_path, memory_limit=0, disk_limit=10)
+
+    put_all(cache, ("1-1", b"aaaa"), ("1-2", b"bbbb"), ("1-3", b"cccc"))
+
+    assert sorted(os.listdir(tmp_path)) == ["1-2", "1-3"]
+    assert asyncio.run(cache.get("1-1")) is None
+    assert asyncio.run(cache.get("1-2")) == b"bbbb"
+    assert cache._disk_size <= 10
+
+
+def test_disk_index_is_rebuilt_on_restart(tmp_path):
+    put_all(PageCache(tmp_path), ("1-1", b"aaaa"), ("1-2", b"bbbb"))
+    # Недописанный файл после падения процесса
+    (tmp_path / "1-3.part").write_bytes(b"cc")
+
+    cache = PageCache(tmp_path)
+
+    assert "1-1" in cache and "1-2" in cache
+    assert "1-3" not in cache
+    assert asyncio.run(cache.get("1-2")) == b"bbbb"
+    assert sorted(os.listdir(tmp_path)) == ["1-1", "1-2"]
+
+
+def test_restart_applies_disk_limit(tmp_path):
+    put_all(PageCache(tmp_path), ("1-1", b"aaaa"), ("1-2", b"bbbb"), ("1-3", b"cccc"))
+
+    cache = PageCache(tmp_path, disk_limit=8)
+
+    assert len(os.listdir(tmp_path)) == 2
+    assert cache._disk_size == 8
+
+
+def test_disk_write_error_keeps_page_in_memory(tmp_path, monkeypatch):
+    cache = PageCache(tmp_path)
+
+    def failing_open(*args, **kwargs):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr("multimng.service.cache.aiofiles.open", failing_open)
+    put_all(cache, ("1-1", b"aaaa"))
+
+    assert asyncio.run(cache.get("1-1")) == b"aaaa"
+    assert cache._disk_size == 0
+    assert os.listdir(tmp_path) == []